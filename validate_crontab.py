@@ -1,15 +1,67 @@
-import re
 import sys
 import os
 import shutil
+import functools
+import operator
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+SPECIAL_SYNTAX_KEYWORDS = frozenset({'reboot', 'hourly', 'daily', 'weekly', 'monthly', 'yearly', 'annually'})
+
+# Accepted values for minute, hour, day of month, month and day of week.
+# Building the string tables once lets each field be checked with a single set lookup.
+CRON_FIELD_VALUES = tuple(
+    frozenset(['*'] + [str(value) for value in range(min_value, max_value + 1)])
+    for min_value, max_value in ((0, 59), (0, 23), (1, 31), (1, 12), (0, 6))
+)
+
+# Characters a valid line can start with, used to reject malformed lines early.
+CRON_FIRST_CHARS = frozenset('@*0123456789')
+
+# Script checks are mostly stat calls and PATH lookups, so for larger crontabs they are
+# spread over a thread pool. Below this many checks the pool isn't worth starting.
+PARALLEL_SCRIPT_CHECK_THRESHOLD = 16
+SCRIPT_CHECK_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Message templates for each kind of error. validate_crontab_file collects errors as
+# (kind, line_no, *data) tuples and only formats them once validation is done, see format_errors.
+# The public per-line functions still return formatted messages.
+ERROR_TEMPLATES = {
+    'syntax': "Syntax error on line {0}: {1}",
+    'missing_script': "Non-existing script or invalid command on line {0}: {1} (resolved path: {2})",
+    'relative_path': (
+        "Recommendation: Use absolute file paths to avoid ambiguity. Replace '{1}' "
+        "with '{2}' on line {0}."
+    ),
+}
+
+def parse_cron_line(line):
+    """
+    Splits a crontab line into its schedule fields and command.
+    Returns the list of parts (the command being the last one), or None if the cron syntax is invalid.
+    """
+    if line[:1] not in CRON_FIRST_CHARS:
+        return None
+    if line.startswith('@'):
+        parts = line.split(None, 1)
+        if len(parts) == 2 and parts[0][1:] in SPECIAL_SYNTAX_KEYWORDS:
+            return parts
+        return None
+
+    parts = line.split(None, 5)
+    if len(parts) < 6:
+        return None
+    for field, allowed_values in zip(parts, CRON_FIELD_VALUES):
+        if field not in allowed_values:
+            return None
+    return parts
 
 def validate_cron_syntax(line):
     """
     Validates the cron syntax for a single crontab line.
+    Part of the public API for use in code; validate_crontab_file goes through check_line_syntax.
     """
-    cron_regex = r'^(\*|([0-9]|[1-5][0-9]))\s+(\*|([0-9]|[1-5][0-9]))\s+(\*|([1-9]|[1-2][0-9]|3[0-1]))\s+(\*|(1[0-2]|[1-9]))\s+(\*|([0-6]))\s+.+$'
-    special_syntax_regex = r'^@(reboot|hourly|daily|weekly|monthly|yearly|annually)\s+.+$'
-    return bool(re.match(cron_regex, line) or re.match(special_syntax_regex, line))
+    return parse_cron_line(line) is not None
 
 def extract_command(line):
     """
@@ -21,58 +73,243 @@ def extract_command(line):
     else:
         return ' '.join(parts[5:])
 
+def check_line_syntax(line, line_no):
+    """
+    Checks the cron syntax of a single crontab line, splitting it only once.
+    Returns (error, command): a 'syntax' error tuple and None if the syntax is invalid,
+    otherwise None and the line's command.
+    """
+    parts = parse_cron_line(line)
+    if parts is None:
+        return ('syntax', line_no, line), None
+    # The command is always the last part, so there is no need to re-split via extract_command
+    return None, parts[-1]
+
+# Linux filesystems are case-sensitive by default, so a name missing from the PATH index is
+# definitely not on PATH. Elsewhere (e.g. macOS) a miss may still match with different case.
+PATH_INDEX_IS_EXACT = sys.platform.startswith('linux')
+
+# Serializes the first build of the PATH index, so concurrent script checks don't each build it.
+PATH_INDEX_LOCK = threading.Lock()
+
+def get_search_path():
+    """
+    Returns the PATH string to search, falling back the same way shutil.which does when PATH is unset.
+    """
+    path = os.environ.get('PATH')
+    if path is None:
+        try:
+            path = os.confstr('CS_PATH')
+        except (AttributeError, ValueError):
+            path = os.defpath
+    return path
+
+@functools.lru_cache(maxsize=1)
+def build_path_index():
+    """
+    Lists every PATH directory once and returns a dict of file name -> candidate paths, in PATH order.
+    Built on first use; PATH changes after that are not picked up, which is fine for a single run.
+    Use get_path_index, which makes sure the index is only built once across threads.
+    """
+    path_index = {}
+    path = get_search_path()
+    # Like shutil.which, an empty PATH finds nothing rather than searching the working directory
+    if not path:
+        return path_index
+    seen_dirs = set()
+    for directory in path.split(os.pathsep):
+        if directory in seen_dirs:
+            continue
+        seen_dirs.add(directory)
+        try:
+            with os.scandir(directory or os.curdir) as entries:
+                for entry in entries:
+                    path_index.setdefault(entry.name, []).append(os.path.join(directory, entry.name))
+        except OSError:
+            continue
+    return path_index
+
+def get_path_index():
+    """
+    Returns the PATH index, building it on first use.
+    """
+    with PATH_INDEX_LOCK:
+        return build_path_index()
+
+@functools.lru_cache(maxsize=1024)
+def find_executable(executable):
+    """
+    Looks up an executable on PATH. Cached, since the same command is often used on many lines.
+    Bare names are looked up in the PATH index, so names that aren't on PATH cost no stat calls.
+    """
+    # Paths are checked directly, and Windows needs shutil.which's PATHEXT handling
+    if os.name != 'posix' or os.path.dirname(executable):
+        return shutil.which(executable)
+    candidates = get_path_index().get(executable)
+    if candidates is None:
+        return None if PATH_INDEX_IS_EXACT else shutil.which(executable)
+    for candidate in candidates:
+        if os.access(candidate, os.X_OK) and not os.path.isdir(candidate):
+            return candidate
+    return None
+
 def is_unix_command(command):
     """
     Checks if the first part of the command is a valid Unix/Linux command.
     """
-    executable = command.split()[0]
-    return shutil.which(executable) is not None
+    executable = command.split(None, 1)[0]
+    return find_executable(executable) is not None
 
-def resolve_path(script_path, crontab_dir):
+@functools.lru_cache(maxsize=1024)
+def stat_path(path):
+    """
+    Returns the os.stat result for a path, or None if it doesn't exist.
+    Cached, since the same script may be referenced from several lines.
+    """
+    try:
+        return os.stat(path)
+    except (OSError, ValueError):
+        return None
+
+def path_exists(path):
+    """
+    Checks if a path exists, using the cached stat result.
+    """
+    return stat_path(path) is not None
+
+def scan_directory(directory):
+    """
+    Lists a directory once and returns a dict of entry name -> os.DirEntry.
+    Returns None if the directory cannot be listed.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name: entry for entry in entries}
+    except OSError:
+        return None
+
+def script_exists_in(resolved_path, crontab_dir, dir_entries):
+    """
+    Checks if a script exists, using the pre-scanned crontab directory listing when possible.
+    The listing is only used to confirm a file exists; names missing from it (e.g. spelled with
+    different case on a case-insensitive filesystem), symlinks and paths outside the crontab
+    directory fall back to a regular existence check.
+    """
+    if dir_entries is not None and os.path.dirname(resolved_path) == crontab_dir:
+        entry = dir_entries.get(os.path.basename(resolved_path))
+        if entry is not None and not entry.is_symlink():
+            return True
+    return path_exists(resolved_path)
+
+def resolve_path(script_path, crontab_dir, is_abs=None):
     """
     Resolves a script path relative to the crontab file's directory if it's a relative path.
+    is_abs can be passed when os.path.isabs(script_path) is already known.
     """
-    if not os.path.isabs(script_path):
+    if is_abs is None:
+        is_abs = os.path.isabs(script_path)
+    if not is_abs:
         return os.path.normpath(os.path.join(crontab_dir, script_path))
     return script_path
 
-def validate_script_or_command(line_no, command, crontab_dir, errors):
+def iter_script_errors(line_no, command, crontab_dir, dir_entries=None):
     """
-    Validates whether the script or command in the crontab line exists or is valid.
-    Updates the errors list with relevant error messages if issues are found.
+    Checks whether the script or command in the crontab line exists or is valid.
+    Yields (kind, line_no, *data) error tuples for any issues found.
+    crontab_dir must be absolute; dir_entries is an optional listing of it as returned by scan_directory.
     """
-    script_path = command.split()[0]
-    resolved_path = resolve_path(script_path, crontab_dir)
+    script_path = command.split(None, 1)[0]
+    is_abs = os.path.isabs(script_path)
+
+    # Since crontab_dir is absolute, the resolved path is already absolute and needs no
+    # further abspath call
+    resolved_path = resolve_path(script_path, crontab_dir, is_abs)
 
-    script_exists = os.path.exists(resolved_path)
-    is_valid_command = is_unix_command(script_path) if not script_exists else False
+    script_exists = script_exists_in(resolved_path, crontab_dir, dir_entries)
+    # An absolute path that doesn't exist can't be found on PATH either, so skip the PATH lookup
+    is_valid_command = not script_exists and not is_abs and find_executable(script_path) is not None
 
     if not script_exists and not is_valid_command:
-        errors.append(f"Non-existing script or invalid command on line {line_no}: {script_path} (resolved path: {resolved_path})")
+        yield ('missing_script', line_no, script_path, resolved_path)
 
-    if not os.path.isabs(script_path):
-        absolute_recommendation = os.path.abspath(resolved_path)
-        errors.append(
-            f"Recommendation: Use absolute file paths to avoid ambiguity. Replace '{script_path}' "
-            f"with '{absolute_recommendation}' on line {line_no}."
-        )
+    if not is_abs:
+        yield ('relative_path', line_no, script_path, resolved_path)
+
+def format_error(error):
+    """
+    Formats a single (kind, line_no, *data) error tuple into its message.
+    """
+    kind, *data = error
+    return ERROR_TEMPLATES[kind].format(*data)
+
+def format_errors(errors):
+    """
+    Formats a list of (kind, line_no, *data) error tuples into a single message.
+    """
+    return "\n".join(map(format_error, errors))
+
+def validate_script_or_command(line_no, command, crontab_dir, errors, dir_entries=None):
+    """
+    Validates whether the script or command in the crontab line exists or is valid.
+    Updates the errors list with relevant error messages if issues are found.
+    dir_entries is an optional listing of crontab_dir as returned by scan_directory.
+    """
+    crontab_dir = os.path.abspath(crontab_dir)
+    for error in iter_script_errors(line_no, command, crontab_dir, dir_entries):
+        errors.append(format_error(error))
 
-def validate_crontab_line(line, line_no, crontab_dir, check_scripts=False):
+def validate_crontab_line(line, line_no, crontab_dir, check_scripts=False, dir_entries=None):
     """
     Validates a single crontab line for both syntax and script/command existence.
-    Updates an errors list if any issues are found.
+    Returns a list of error messages.
+    Part of the public API for use in code; validate_crontab_file shares its logic through
+    check_line_syntax but runs the script checks separately, see validate_scripts.
     """
     errors = []
 
-    # Validate cron syntax
-    if not validate_cron_syntax(line):
-        errors.append(f"Syntax error on line {line_no}: {line}")
+    syntax_error, command = check_line_syntax(line, line_no)
+    if syntax_error is not None:
+        errors.append(format_error(syntax_error))
     elif check_scripts:
-        command = extract_command(line)
-        validate_script_or_command(line_no, command, crontab_dir, errors)
+        validate_script_or_command(line_no, command, crontab_dir, errors, dir_entries)
 
     return errors
 
+def validate_scripts(script_checks, crontab_dir, dir_entries=None):
+    """
+    Validates the script or command of each (line_no, command) pair in script_checks.
+    Uses a thread pool when there are enough checks to benefit from overlapping the I/O.
+    Returns the error tuples in line order.
+    """
+    errors = []
+    if len(script_checks) < PARALLEL_SCRIPT_CHECK_THRESHOLD:
+        for line_no, command in script_checks:
+            errors.extend(iter_script_errors(line_no, command, crontab_dir, dir_entries))
+        return errors
+
+    def check(script_check):
+        line_no, command = script_check
+        return list(iter_script_errors(line_no, command, crontab_dir, dir_entries))
+
+    # executor.map yields results in submission order, so errors stay sorted by line
+    with ThreadPoolExecutor(max_workers=SCRIPT_CHECK_MAX_WORKERS) as executor:
+        for line_errors in executor.map(check, script_checks):
+            errors.extend(line_errors)
+    return errors
+
+def iter_crontab_lines(file):
+    """
+    Yields (line_no, line) for each non-blank, non-comment line of a crontab file, stripped.
+    """
+    for line_no, line in enumerate(file, start=1):
+        # Skip comments and blank lines before stripping, to avoid copying them
+        if line[:1] in ('#', '\n') or line.isspace():
+            continue
+        line = line.strip()
+        if line.startswith('#'):
+            continue
+        yield line_no, line
+
 def validate_crontab_file(file_path, check_scripts=False):
     """
     Reads and validates a crontab file.
@@ -81,26 +318,36 @@ def validate_crontab_file(file_path, check_scripts=False):
     """
     crontab_dir = os.path.dirname(os.path.abspath(file_path))
 
+    # List the crontab directory once instead of checking each script separately
+    dir_entries = scan_directory(crontab_dir) if check_scripts else None
+    errors = []
+    script_checks = []
+
     try:
-        with open(file_path, 'r') as file:
-            lines = file.readlines()
+        file = open(file_path, 'r')
     except FileNotFoundError:
         return False, f"Error: File '{file_path}' not found."
     except PermissionError:
         return False, f"Error: Permission denied for file '{file_path}'."
 
-    errors = []
-    for line_no, line in enumerate(lines, start=1):
-        line = line.strip()
-        if not line or line.startswith('#'):
-            continue
+    # Stream the file line by line rather than reading it into memory
+    with file:
+        for line_no, line in iter_crontab_lines(file):
+            # Check the syntax right away and queue the script checks, which are I/O bound
+            syntax_error, command = check_line_syntax(line, line_no)
+            if syntax_error is not None:
+                errors.append(syntax_error)
+            elif check_scripts:
+                script_checks.append((line_no, command))
 
-        # Validate each line using the modular function
-        line_errors = validate_crontab_line(line, line_no, crontab_dir, check_scripts=check_scripts)
-        errors.extend(line_errors)
+    if script_checks:
+        errors.extend(validate_scripts(script_checks, crontab_dir, dir_entries))
+        # Merge syntax and script errors back into line order; the sort is stable, so
+        # the errors of a single line keep their relative order
+        errors.sort(key=operator.itemgetter(1))
 
     if errors:
-        return False, "\n".join(errors)
+        return False, format_errors(errors)
 
     return True, "The crontab file is valid."
 